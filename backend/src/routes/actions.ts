@@ -10,6 +10,13 @@ const gpioOutputConfigSchema = z.object({
   duration: z.number().min(0).optional(), // Duration in ms (for pulse)
 });
 
+const pwmConfigSchema = z.object({
+  pin: z.number().min(0).max(40),
+  frequency: z.number().positive().optional(), // Hz; client default: 1000 on hardware PWM pins, 50 otherwise
+  dutyCycle: z.number().min(0).max(100), // %
+  fadeDuration: z.number().min(0).optional(), // Ramp from current duty cycle, in ms
+});
+
 const httpRequestConfigSchema = z.object({
   url: z.string().url(),
   method: z.enum(['GET', 'POST', 'PUT', 'DELETE']).default('POST'),
@@ -23,7 +30,7 @@ const delayConfigSchema = z.object({
 
 const createActionSchema = z.object({
   name: z.string().min(1),
-  type: z.enum(['gpio_output', 'http_request', 'delay']),
+  type: z.enum(['gpio_output', 'pwm', 'http_request', 'delay']),
   config: z.record(z.any()),
   order: z.number().default(0),
   triggerId: z.string().uuid(),
@@ -10,6 +10,8 @@ const gpioInputConfigSchema = z.object({
   edge: z.enum(['rising', 'falling', 'both']).default('rising'),
   pull: z.enum(['up', 'down', 'none']).default('up'),
   debounce: z.number().min(0).default(50),
+  aggregateAbove: z.number().min(0).optional(), // Fires/s above which the device sends summaries
+  summaryInterval: z.number().min(100).optional(), // Summary period in ms
 });
 
 const scheduleConfigSchema = z.object({
@@ -39,6 +41,10 @@ const createTriggerSchema = z.object({
 
 const updateTriggerSchema = createTriggerSchema.partial().omit({ deviceId: true });
 
+const fireTriggerSchema = z.object({
+  executeAt: z.string().datetime().optional(), // Deferred, clock-synchronized execution
+});
+
 // GET all triggers
 triggerRouter.get('/', async (_, res) => {
   try {
@@ -140,6 +146,7 @@ triggerRouter.delete('/:id', async (req, res) => {
 // POST fire trigger manually (for testing)
 triggerRouter.post('/:id/fire', async (req, res) => {
   try {
+    const { executeAt } = fireTriggerSchema.parse(req.body ?? {});
     const trigger = await prisma.trigger.findUnique({
       where: { id: req.params.id },
       include: { device: true, actions: { orderBy: { order: 'asc' } } },
@@ -157,7 +164,7 @@ triggerRouter.post('/:id/fire', async (req, res) => {
     }
     
     // Send command to device via WebSocket
-    const sent = await fireTriggerOnDevice(trigger.deviceId, trigger.id);
+    const sent = await fireTriggerOnDevice(trigger.deviceId, trigger.id, executeAt);
     
     if (!sent) {
       return res.status(500).json({ error: 'Erreur lors de l\'envoi de la commande au device' });
@@ -170,13 +177,16 @@ triggerRouter.post('/:id/fire', async (req, res) => {
         triggerId: trigger.id,
         type: 'trigger_fired',
         message: `Trigger "${trigger.name}" déclenché manuellement`,
-        metadata: JSON.stringify({ manual: true }),
+        metadata: JSON.stringify({ manual: true, executeAt }),
       },
     });
     
     res.json({ status: 'fired', trigger, sent: true });
   } catch (error) {
     console.error('Erreur fire trigger:', error);
+    if (error instanceof z.ZodError) {
+      return res.status(400).json({ error: error.errors });
+    }
     res.status(500).json({ error: 'Erreur lors du déclenchement' });
   }
 });
@@ -76,6 +76,14 @@ async function handleMessage(ws: WebSocket, message: any) {
       await handleActionExecuted(deviceId, payload);
       break;
 
+    case 'trigger_summary':
+      await handleTriggerSummary(deviceId, payload);
+      break;
+
+    case 'trigger_timing':
+      await handleTriggerTiming(deviceId, payload);
+      break;
+
     case 'error':
       await handleDeviceError(deviceId, payload);
       break;
@@ -163,6 +171,39 @@ async function handleActionExecuted(deviceId: string, payload: any) {
   console.log(`⚡ Action ${actionName} ${success ? 'executed' : 'failed'} on device ${deviceId}`);
 }
 
+async function handleTriggerSummary(deviceId: string, payload: any) {
+  const { triggerId, triggerName, count } = payload;
+
+  // One row per summary period instead of one per fire
+  await prisma.eventLog.create({
+    data: {
+      deviceId,
+      triggerId,
+      type: 'trigger_summary',
+      message: `Trigger "${triggerName}" déclenché ${count} fois`,
+      metadata: JSON.stringify(payload),
+    },
+  });
+
+  console.log(`📊 Trigger ${triggerName} fired ${count} times on device ${deviceId}`);
+}
+
+async function handleTriggerTiming(deviceId: string, payload: any) {
+  const { triggerId, triggerName, skewMs } = payload;
+
+  await prisma.eventLog.create({
+    data: {
+      deviceId,
+      triggerId,
+      type: 'trigger_timing',
+      message: `Trigger "${triggerName}" exécuté avec un écart de ${skewMs} ms`,
+      metadata: JSON.stringify(payload),
+    },
+  });
+
+  console.log(`⏱️ Trigger ${triggerName} skew ${skewMs}ms on device ${deviceId}`);
+}
+
 async function handleDeviceError(deviceId: string, payload: any) {
   const { error, context } = payload;
 
@@ -240,7 +281,12 @@ export function sendConfigUpdate(deviceId: string) {
 }
 
 // Function to fire a trigger on a specific device
-export async function fireTriggerOnDevice(deviceId: string, triggerId: string): Promise<boolean> {
+// executeAt (ISO date) defers execution on the device to that instant, using its synchronized clock
+export async function fireTriggerOnDevice(
+  deviceId: string,
+  triggerId: string,
+  executeAt?: string
+): Promise<boolean> {
   const conn = connections.get(deviceId);
   if (!conn) {
     console.log(`⚠️ Device ${deviceId} non connecté - impossible d'exécuter le trigger`);
@@ -270,6 +316,7 @@ export async function fireTriggerOnDevice(deviceId: string, triggerId: string):
       config: JSON.parse(a.config),
       order: a.order,
     })),
+    ...(executeAt && { executeAt }),
   };
 
   conn.ws.send(JSON.stringify(message));
@@ -14,6 +14,7 @@ import {
   Clock,
   Globe,
   Timer,
+  Activity,
 } from 'lucide-react';
 import { devicesApi, triggersApi, actionsApi } from '../api';
 import Card from '../components/Card';
@@ -32,6 +33,7 @@ const triggerTypeOptions = [
 
 const actionTypeOptions = [
   { value: 'gpio_output', label: 'Sortie GPIO' },
+  { value: 'pwm', label: 'Sortie PWM' },
   { value: 'http_request', label: 'Requête HTTP' },
   { value: 'delay', label: 'Délai' },
 ];
@@ -99,6 +101,8 @@ export default function DeviceDetailPage() {
         edge: formData.get('edge') || 'falling',
         pull: formData.get('pull') || 'up',
         debounce: parseInt(formData.get('debounce') as string) || 50,
+        aggregateAbove: formData.get('aggregateAbove') ? parseFloat(formData.get('aggregateAbove') as string) : undefined,
+        summaryInterval: formData.get('summaryInterval') ? parseInt(formData.get('summaryInterval') as string) : undefined,
       };
     } else if (triggerType === 'schedule') {
       config = {
@@ -128,6 +132,13 @@ export default function DeviceDetailPage() {
         state: formData.get('state') || 'high',
         duration: formData.get('duration') ? parseInt(formData.get('duration') as string) : undefined,
       };
+    } else if (actionType === 'pwm') {
+      config = {
+        pin: parseInt(formData.get('pin') as string),
+        frequency: formData.get('frequency') ? parseFloat(formData.get('frequency') as string) : undefined,
+        dutyCycle: parseFloat(formData.get('dutyCycle') as string),
+        fadeDuration: formData.get('fadeDuration') ? parseInt(formData.get('fadeDuration') as string) : undefined,
+      };
     } else if (actionType === 'http_request') {
       config = {
         url: formData.get('url'),
@@ -159,6 +170,7 @@ export default function DeviceDetailPage() {
   const getActionIcon = (type: string) => {
     switch (type) {
       case 'gpio_output': return Zap;
+      case 'pwm': return Activity;
       case 'http_request': return Globe;
       case 'delay': return Timer;
       default: return Zap;
@@ -344,6 +356,7 @@ export default function DeviceDetailPage() {
                                   <p className="font-medium text-white">{action.name}</p>
                                   <p className="text-sm text-slate-400">
                                     {action.type === 'gpio_output' && `GPIO ${actionConfig.pin} → ${actionConfig.state}${actionConfig.duration ? ` (${actionConfig.duration}ms)` : ''}`}
+                                    {action.type === 'pwm' && `GPIO ${actionConfig.pin} → ${actionConfig.frequency ? `${actionConfig.frequency}Hz ` : ''}${actionConfig.dutyCycle}%${actionConfig.fadeDuration ? ` (rampe ${actionConfig.fadeDuration}ms)` : ''}`}
                                     {action.type === 'http_request' && `${actionConfig.method} ${actionConfig.url}`}
                                     {action.type === 'delay' && `Attendre ${actionConfig.duration}ms`}
                                   </p>
@@ -455,6 +468,21 @@ export default function DeviceDetailPage() {
                 min="0"
                 defaultValue="50"
               />
+              <Input
+                label="Résumé au-delà de (déclenchements/s)"
+                name="aggregateAbove"
+                type="number"
+                min="0"
+                step="any"
+                placeholder="10 (0 = jamais)"
+              />
+              <Input
+                label="Période des résumés (ms)"
+                name="summaryInterval"
+                type="number"
+                min="100"
+                placeholder="1000"
+              />
             </div>
           )}
 
@@ -547,6 +575,46 @@ export default function DeviceDetailPage() {
             </div>
           )}
 
+          {/* PWM Config */}
+          {actionType === 'pwm' && (
+            <div className="grid grid-cols-2 gap-4 p-4 rounded-xl bg-white/5">
+              <Input
+                label="Pin GPIO"
+                name="pin"
+                type="number"
+                min="0"
+                max="40"
+                required
+                placeholder="18"
+              />
+              <Input
+                label="Fréquence (Hz)"
+                name="frequency"
+                type="number"
+                min="1"
+                step="any"
+                placeholder="1000 (matériel) / 50 (logiciel)"
+              />
+              <Input
+                label="Rapport cyclique (%)"
+                name="dutyCycle"
+                type="number"
+                min="0"
+                max="100"
+                step="any"
+                required
+                placeholder="50"
+              />
+              <Input
+                label="Rampe (ms, optionnel)"
+                name="fadeDuration"
+                type="number"
+                min="0"
+                placeholder="Changement immédiat"
+              />
+            </div>
+          )}
+
           {/* HTTP Request Config */}
           {actionType === 'http_request' && (
             <div className="p-4 rounded-xl bg-white/5 space-y-4">
@@ -32,6 +32,7 @@ export default function EventsPage() {
   const getEventIcon = (type: string) => {
     switch (type) {
       case 'trigger_fired': return Zap;
+      case 'trigger_summary': return Zap;
       case 'action_executed': return Play;
       case 'device_connected': return Wifi;
       case 'device_disconnected': return WifiOff;
@@ -43,6 +44,7 @@ export default function EventsPage() {
   const getEventColor = (type: string) => {
     switch (type) {
       case 'trigger_fired': return 'text-amber-400 bg-amber-500/20';
+      case 'trigger_summary': return 'text-amber-400 bg-amber-500/20';
       case 'action_executed': return 'text-emerald-400 bg-emerald-500/20';
       case 'device_connected': return 'text-blue-400 bg-blue-500/20';
       case 'device_disconnected': return 'text-slate-400 bg-slate-500/20';
@@ -54,6 +56,7 @@ export default function EventsPage() {
   const getEventLabel = (type: string) => {
     switch (type) {
       case 'trigger_fired': return 'Trigger';
+      case 'trigger_summary': return 'Résumé trigger';
       case 'action_executed': return 'Action';
       case 'device_connected': return 'Connexion';
       case 'device_disconnected': return 'Déconnexion';
@@ -29,6 +29,8 @@ export interface TriggerConfig {
   edge?: 'rising' | 'falling' | 'both';
   pull?: 'up' | 'down' | 'none';
   debounce?: number;
+  aggregateAbove?: number;
+  summaryInterval?: number;
   // Schedule
   cron?: string;
   timezone?: string;
@@ -56,6 +58,10 @@ export interface ActionConfig {
   pin?: number;
   state?: 'high' | 'low' | 'toggle';
   duration?: number;
+  // PWM
+  frequency?: number;
+  dutyCycle?: number;
+  fadeDuration?: number;
   // HTTP Request
   url?: string;
   method?: 'GET' | 'POST' | 'PUT' | 'DELETE';
@@ -67,7 +73,7 @@ export interface ActionConfig {
 export interface Action {
   id: string;
   name: string;
-  type: 'gpio_output' | 'http_request' | 'delay';
+  type: 'gpio_output' | 'pwm' | 'http_request' | 'delay';
   config: string;
   order: number;
   triggerId: string;
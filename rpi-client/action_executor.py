@@ -13,14 +13,29 @@ class ActionExecutor:
         self.ws_client = ws_client
         self._output_pins_setup: set[int] = set()
 
-    def execute_actions(self, trigger_id: str, trigger_name: str, actions: list[dict]) -> bool:
-        """Exécute une séquence d'actions."""
+    def execute_actions(
+        self,
+        trigger_id: str,
+        trigger_name: str,
+        actions: list[dict],
+        report: bool = True,
+        due: float = 0.0,
+    ) -> bool:
+        """Exécute une séquence d'actions.
+
+        Avec `report=False`, les notifications action_executed ne sont pas envoyées
+        (déclenchements agrégés dans un résumé) ; les erreurs le sont toujours.
+
+        Avec `due` (time.monotonic), la séquence peut être lancée en avance : les
+        sorties GPIO sont confiées au thread de sortie pour cette échéance et les
+        autres actions attendent l'échéance avant de s'exécuter.
+        """
         success = True
 
         for action in actions:
             try:
-                action_success = self._execute_action(action)
-                if self.ws_client:
+                action_success = self._execute_action(action, due)
+                if self.ws_client and report:
                     self.ws_client.send_action_executed(
                         trigger_id=trigger_id,
                         action_id=action["id"],
@@ -37,7 +52,7 @@ class ActionExecutor:
 
         return success
 
-    def _execute_action(self, action: dict) -> bool:
+    def _execute_action(self, action: dict, due: float = 0.0) -> bool:
         """Exécute une action individuelle."""
         action_type = action["type"]
         config = action["config"]
@@ -46,7 +61,14 @@ class ActionExecutor:
         print(f"▶️  Exécution: {name} ({action_type})")
 
         if action_type == "gpio_output":
-            return self._execute_gpio_output(config)
+            return self._execute_gpio_output(config, due)
+
+        remaining = due - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+        if action_type == "pwm":
+            return self._execute_pwm(config)
         elif action_type == "http_request":
             return self._execute_http_request(config)
         elif action_type == "delay":
@@ -55,7 +77,7 @@ class ActionExecutor:
             print(f"⚠️  Type d'action inconnu: {action_type}")
             return False
 
-    def _execute_gpio_output(self, config: dict) -> bool:
+    def _execute_gpio_output(self, config: dict, due: float = 0.0) -> bool:
         """Exécute une action de sortie GPIO."""
         pin = config["pin"]
         state = config["state"]
@@ -67,16 +89,30 @@ class ActionExecutor:
             self._output_pins_setup.add(pin)
 
         if state == "toggle":
-            self.gpio.toggle_output(pin)
+            self.gpio.toggle_output(pin, due)
         elif duration:
             # Pulse: activer pendant une durée
             target_state = state == "high"
-            self.gpio.pulse_output(pin, target_state, duration)
+            self.gpio.pulse_output(pin, target_state, duration, due)
         else:
             # État permanent
             target_state = state == "high"
-            self.gpio.set_output(pin, target_state)
+            self.gpio.set_output(pin, target_state, due)
+
+        return True
+
+    def _execute_pwm(self, config: dict) -> bool:
+        """Exécute une action de sortie PWM."""
+        pin = config["pin"]
+        frequency = config.get("frequency")
+        duty_cycle = config.get("dutyCycle", 50)
+        fade_duration = config.get("fadeDuration", 0)
+
+        if not 0 <= duty_cycle <= 100:
+            print(f"⚠️  Rapport cyclique invalide: {duty_cycle}%")
+            return False
 
+        self.gpio.set_pwm(pin, frequency, duty_cycle, fade_duration)
         return True
 
     def _execute_http_request(self, config: dict) -> bool:
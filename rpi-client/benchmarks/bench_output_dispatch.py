@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Benchmark du thread de sortie GPIO sous charge CPU et réseau synthétique.
+
+Compare l'ancien chemin (écriture sur le thread demandeur, fin d'impulsion par
+`threading.Timer`) avec `OutputDispatcher` :
+
+- latence d'une écriture immédiate (demande -> écriture physique simulée) ;
+- retard d'une écriture datée (fin d'impulsion) par rapport à son échéance.
+
+Chaque mesure est faite avec l'intervalle de bascule du GIL par défaut de Python
+(réglage livré, `OUTPUT_SWITCH_INTERVAL=0`) puis avec 0,5 ms.
+
+    python benchmarks/bench_output_dispatch.py --samples 500
+    sudo python benchmarks/bench_output_dispatch.py --cpu 3 --rt-priority 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from output_dispatcher import OutputDispatcher  # noqa: E402
+
+MESSAGE = json.dumps({
+    "type": "execute_trigger",
+    "triggerId": "11111111-1111-1111-1111-111111111111",
+    "actions": [{"id": str(i), "name": "Relais", "type": "gpio_output", "config": {"pin": 24}} for i in range(20)],
+})
+
+
+def cpu_load(stop: threading.Event):
+    """Charge CPU sous GIL : parsing/sérialisation JSON en boucle."""
+    while not stop.is_set():
+        json.dumps(json.loads(MESSAGE))
+
+
+def network_load(stop: threading.Event):
+    """Charge réseau : boucle asyncio qui reçoit et décode un flot de messages."""
+    async def run():
+        reader_sock, writer_sock = socket.socketpair()
+        reader, _ = await asyncio.open_connection(sock=reader_sock)
+        _, writer = await asyncio.open_connection(sock=writer_sock)
+        line = MESSAGE.encode() + b"\n"
+        while not stop.is_set():
+            writer.write(line * 20)
+            await writer.drain()
+            for _ in range(20):
+                line_in = await reader.readline()
+                if not line_in:
+                    return
+                json.loads(line_in)
+        writer.close()
+
+    asyncio.run(run())
+
+
+class Recorder:
+    """GPIO simulé : horodate l'écriture de chaque échantillon (pin = n° d'échantillon)."""
+
+    def __init__(self, samples: int):
+        self.written = [0.0] * samples
+
+    def write(self, pin: int, state: bool):
+        self.written[pin] = time.perf_counter()
+
+
+def measure(path: str, kind: str, samples: int, interval: float, options: dict) -> list[float]:
+    """Retourne les latences (µs) de `samples` écritures demandées depuis un thread producteur."""
+    recorder = Recorder(samples)
+    expected = [0.0] * samples
+    dispatcher = None
+    if path == "dispatcher":
+        dispatcher = OutputDispatcher(recorder.write, **options)
+        dispatcher.start()
+
+    def produce():
+        for i in range(samples):
+            if kind == "immediate":
+                expected[i] = time.perf_counter()
+                if dispatcher:
+                    dispatcher.submit(i, True)
+                else:
+                    recorder.write(i, True)
+            else:
+                delay = 0.005
+                expected[i] = time.perf_counter() + delay
+                if dispatcher:
+                    dispatcher.submit(i, False, due=time.monotonic() + delay)
+                else:
+                    threading.Timer(delay, recorder.write, args=(i, False)).start()
+            time.sleep(interval)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    producer.join()
+    time.sleep(0.05)
+    if dispatcher:
+        dispatcher.stop()
+
+    return sorted((w - e) * 1e6 for w, e in zip(recorder.written, expected) if w)
+
+
+LOADS = {
+    "repos": [],
+    "cpu": [cpu_load, cpu_load],
+    "réseau": [network_load],
+    "cpu+réseau": [cpu_load, network_load],
+}
+
+
+def run_load(gil: str, load_name: str, workers: list, args, options: dict):
+    """Mesure les deux chemins, écritures immédiates et datées, sous une charge donnée."""
+    stop = threading.Event()
+    threads = [threading.Thread(target=w, args=(stop,), daemon=True) for w in workers]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+
+    for kind in ("immediate", "timed"):
+        for path in ("legacy", "dispatcher"):
+            lat = measure(path, kind, args.samples, args.interval, options)
+            p50, p99, worst = lat[len(lat) // 2], lat[int(len(lat) * 0.99)], lat[-1]
+            print(f"{gil:<8} {load_name:<11} {kind:<10} {path:<11} {p50:>7.0f}µs {p99:>7.0f}µs {worst:>7.0f}µs")
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--interval", type=float, default=0.002, help="intervalle entre demandes (s)")
+    parser.add_argument("--cpu", type=int, default=None, help="CPU du thread de sortie")
+    parser.add_argument("--rt-priority", type=int, default=0, help="priorité SCHED_FIFO (0 = aucune)")
+    parser.add_argument(
+        "--switch-interval", type=float, nargs="+", default=[0.0, 0.0005],
+        help="intervalles de bascule du GIL (s) mesurés, appliqués aux deux chemins ; 0 = défaut Python",
+    )
+    args = parser.parse_args()
+    options = {"cpu": args.cpu, "rt_priority": args.rt_priority}
+    default_interval = sys.getswitchinterval()
+
+    print(f"{'GIL':<8} {'charge':<11} {'écriture':<10} {'chemin':<11} {'p50':>9} {'p99':>9} {'max':>9}")
+    for interval in args.switch_interval:
+        sys.setswitchinterval(interval or default_interval)
+        gil = f"{(interval or default_interval) * 1000:g}ms"
+        for load_name, workers in LOADS.items():
+            run_load(gil, load_name, workers, args, options)
+
+
+if __name__ == "__main__":
+    main()
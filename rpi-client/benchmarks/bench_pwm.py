@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Benchmark du moteur PWM logiciel sur GPIO simulé.
+
+Mesure la fréquence obtenue, la gigue des fronts montants et le temps CPU pour
+une boucle naïve `time.sleep` (un thread par sortie), le moteur écrivant
+directement, et le chemin réel du client (`GPIOHandler.set_pwm`, fronts
+exécutés par le thread de sortie).
+
+    python benchmarks/bench_pwm.py --duration 3
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ["SIMULATION_MODE"] = "true"
+
+from gpio_handler import GPIOHandler  # noqa: E402
+from pwm import PWMEngine  # noqa: E402
+
+# (pin, fréquence Hz, rapport cyclique) : servo, gradateur, buzzer
+SCENARIOS = [(17, 50, 0.075), (27, 100, 0.5), (22, 200, 0.5)]
+
+
+class EdgeRecorder:
+    """GPIO simulé qui horodate chaque front."""
+
+    def __init__(self):
+        self.edges: dict[int, list[tuple[float, bool]]] = {}
+
+    def write(self, pin: int, state: bool):
+        self.edges.setdefault(pin, []).append((time.perf_counter(), state))
+
+
+class RecordingGPIOHandler(GPIOHandler):
+    """GPIOHandler dont l'écriture physique horodate les fronts."""
+
+    def __init__(self, recorder: EdgeRecorder):
+        self.recorder = recorder
+        super().__init__()
+
+    def _gpio_write(self, pin: int, state: bool):
+        self.recorder.write(pin, state)
+
+
+def sleep_loop(write, pin: int, frequency: float, duty: float, stop: threading.Event):
+    """Référence : PWM par time.sleep, sans compensation."""
+    period = 1.0 / frequency
+    while not stop.is_set():
+        write(pin, True)
+        time.sleep(period * duty)
+        write(pin, False)
+        time.sleep(period * (1 - duty))
+
+
+def analyze(edges: list[tuple[float, bool]], frequency: float, duty: float) -> dict:
+    rising = [t for t, state in edges if state]
+    periods = [b - a for a, b in zip(rising, rising[1:])]
+    highs = []
+    for (t0, s0), (t1, s1) in zip(edges, edges[1:]):
+        if s0 and not s1:
+            highs.append(t1 - t0)
+    expected = 1.0 / frequency
+    achieved = (len(rising) - 1) / (rising[-1] - rising[0]) if len(rising) > 1 else 0.0
+    deviations = sorted(abs(p - expected) for p in periods)
+    return {
+        "freq": achieved,
+        "freq_err": (achieved - frequency) / frequency * 100,
+        "duty": statistics.mean(highs) / expected * 100 if highs else 0.0,
+        "jitter_std_us": statistics.pstdev(periods) * 1e6 if periods else 0.0,
+        "jitter_p99_us": deviations[int(len(deviations) * 0.99)] * 1e6 if deviations else 0.0,
+    }
+
+
+def run(mode: str, duration: float) -> tuple[dict[int, dict], float]:
+    recorder = EdgeRecorder()
+    cpu_start = time.process_time()
+    if mode == "engine":
+        engine = PWMEngine(recorder.write)
+        for pin, frequency, duty in SCENARIOS:
+            engine.start(pin, frequency, duty)
+        time.sleep(duration)
+        engine.stop_all()
+    elif mode == "gpio":
+        gpio = RecordingGPIOHandler(recorder)
+        for pin, frequency, duty in SCENARIOS:
+            gpio.set_pwm(pin, frequency, duty * 100)
+        time.sleep(duration)
+        gpio.cleanup()
+    else:
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=sleep_loop, args=(recorder.write, pin, f, d, stop), daemon=True)
+            for pin, f, d in SCENARIOS
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    cpu = (time.process_time() - cpu_start) / duration * 100
+    return {pin: analyze(recorder.edges.get(pin, []), f, d) for pin, f, d in SCENARIOS}, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=3.0, help="durée par mode (s)")
+    args = parser.parse_args()
+
+    print(f"{'mode':<7} {'cible':>12} {'obtenue':>10} {'erreur':>8} {'duty':>7} {'gigue σ':>10} {'gigue p99':>10}")
+    for mode in ("sleep", "engine", "gpio"):
+        results, cpu = run(mode, args.duration)
+        for pin, frequency, duty in SCENARIOS:
+            r = results[pin]
+            print(
+                f"{mode:<7} {frequency:>6}Hz {duty * 100:>3.0f}% {r['freq']:>8.2f}Hz {r['freq_err']:>+7.2f}% "
+                f"{r['duty']:>6.1f}% {r['jitter_std_us']:>8.1f}µs {r['jitter_p99_us']:>8.1f}µs"
+            )
+        print(f"{mode:<7} CPU {cpu:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Benchmark de la file d'envoi sous un flot d'événements action_executed.
+
+Compare l'ancien chemin (un `asyncio.create_task` par message) avec la file
+prioritaire bornée : mémoire résidente et retard des pings heartbeat.
+
+    python benchmarks/bench_send_queue.py --rate 10000 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from send_queue import SendQueue, PRIORITY_CONTROL, PRIORITY_TELEMETRY  # noqa: E402
+
+
+def rss_kb() -> int:
+    """Mémoire résidente actuelle du process (ko)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+class SlowLink:
+    """WebSocket simulé : envois sérialisés à débit limité."""
+
+    def __init__(self, bandwidth: int):
+        self.bandwidth = bandwidth  # octets/s
+        self._lock = asyncio.Lock()
+        self.ping_delays: list[float] = []
+        self.sent = 0
+
+    async def send(self, data: str):
+        async with self._lock:
+            await asyncio.sleep(len(data) / self.bandwidth)
+            self.sent += 1
+            message = json.loads(data)
+            if message["type"] == "ping":
+                self.ping_delays.append(time.perf_counter() - message["t"])
+
+
+def action_message(i: int) -> dict:
+    return {
+        "type": "action_executed",
+        "deviceId": "00000000-0000-0000-0000-000000000000",
+        "triggerId": "11111111-1111-1111-1111-111111111111",
+        "actionId": f"action-{i}",
+        "actionName": "Relais",
+        "success": True,
+    }
+
+
+async def run(mode: str, rate: int, duration: float, heartbeat: float, bandwidth: int, max_bytes: int) -> dict:
+    link = SlowLink(bandwidth)
+    queue = SendQueue(max_bytes=max_bytes)
+    queue.attach(asyncio.get_running_loop())
+    pending: set[asyncio.Task] = set()
+
+    def send(message: dict, priority: int):
+        if mode == "legacy":
+            task = asyncio.create_task(link.send(json.dumps(message)))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        else:
+            queue.put(message, priority)
+
+    async def writer():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            await link.send(item[0])
+
+    async def heartbeat_loop():
+        while True:
+            await asyncio.sleep(heartbeat)
+            send({"type": "ping", "t": time.perf_counter()}, PRIORITY_CONTROL)
+
+    writer_task = asyncio.create_task(writer())
+    heartbeat_task = asyncio.create_task(heartbeat_loop())
+
+    tick = 0.01
+    batch = max(1, int(rate * tick))
+    peak_rss = rss_kb()
+    start = time.perf_counter()
+    i = 0
+    while time.perf_counter() - start < duration:
+        for _ in range(batch):
+            send(action_message(i), PRIORITY_TELEMETRY)
+            i += 1
+        peak_rss = max(peak_rss, rss_kb())
+        await asyncio.sleep(tick)
+
+    heartbeat_task.cancel()
+    writer_task.cancel()
+    for task in pending:
+        task.cancel()
+
+    delays = sorted(link.ping_delays)
+    return {
+        "mode": mode,
+        "produced": i,
+        "sent": link.sent,
+        "dropped": sum(queue.dropped.values()),
+        "peak_rss_kb": peak_rss,
+        "pings": len(delays),
+        "ping_max_ms": delays[-1] * 1000 if delays else None,
+        "ping_p50_ms": delays[len(delays) // 2] * 1000 if delays else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=int, default=10000, help="événements/s")
+    parser.add_argument("--duration", type=float, default=10.0, help="durée (s)")
+    parser.add_argument("--heartbeat", type=float, default=1.0, help="intervalle des pings (s)")
+    parser.add_argument("--bandwidth", type=int, default=500_000, help="débit du lien simulé (octets/s)")
+    parser.add_argument("--max-bytes", type=int, default=256 * 1024, help="budget de la file (octets)")
+    parser.add_argument("--mode", choices=["legacy", "queue"], help="exécuter un seul mode (interne)")
+    args = parser.parse_args()
+
+    if args.mode:
+        result = asyncio.run(run(args.mode, args.rate, args.duration, args.heartbeat, args.bandwidth, args.max_bytes))
+        print(json.dumps(result))
+        return
+
+    # Chaque mode dans un process séparé pour une mesure RSS propre
+    print(f"{'mode':<8} {'produits':>9} {'envoyés':>8} {'perdus':>8} {'RSS max':>10} {'ping p50':>10} {'ping max':>10}")
+    for mode in ("legacy", "queue"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode] + sys.argv[1:],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        r = json.loads(out)
+        p50 = f"{r['ping_p50_ms']:.1f}ms" if r["pings"] else "aucun"
+        pmax = f"{r['ping_max_ms']:.1f}ms" if r["pings"] else "aucun"
+        print(
+            f"{mode:<8} {r['produced']:>9} {r['sent']:>8} {r['dropped']:>8} "
+            f"{r['peak_rss_kb'] / 1024:>8.1f}Mo {p50:>10} {pmax:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark de l'agrégation adaptative des notifications de triggers.
+
+Pour 10, 100 et 1000 déclenchements/s, compare l'ancien comportement (un
+message trigger_fired par déclenchement) avec `TelemetryAggregator` : nombre de
+messages envoyés et temps CPU du client (sérialisation JSON comprise).
+
+    python benchmarks/bench_telemetry.py --duration 5
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from telemetry import TelemetryAggregator  # noqa: E402
+
+TRIGGER_ID = "11111111-1111-1111-1111-111111111111"
+DEVICE_ID = "00000000-0000-0000-0000-000000000000"
+
+
+class Sink:
+    """Remplace la file d'envoi : sérialise et compte les messages."""
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def send(self, message: dict):
+        data = json.dumps({"deviceId": DEVICE_ID, **message})
+        with self._lock:
+            self.messages += 1
+            self.bytes += len(data)
+
+
+def run(mode: str, rate: int, duration: float, threshold: float) -> dict:
+    sink = Sink()
+    aggregator = TelemetryAggregator(
+        on_summary=lambda s: sink.send({"type": "trigger_summary", **s}),
+        default_rate=threshold,
+    )
+    aggregator.configure(TRIGGER_ID, "Vibration", {})
+
+    def fire():
+        if mode == "legacy" or aggregator.record(TRIGGER_ID):
+            sink.send({"type": "trigger_fired", "triggerId": TRIGGER_ID, "triggerName": "Vibration"})
+
+    # Déclenchements cadencés par lots de 1ms, comme des callbacks GPIO successifs
+    period = 1.0 / rate
+    cpu_start = time.process_time()
+    start = time.monotonic()
+    fired = 0
+    while True:
+        now = time.monotonic()
+        if now - start >= duration:
+            break
+        due = int((now - start) / period) + 1
+        while fired < due:
+            fire()
+            fired += 1
+        time.sleep(min(period, 0.001))
+    aggregator.clear()
+    cpu = time.process_time() - cpu_start
+
+    return {"fired": fired, "messages": sink.messages, "bytes": sink.bytes, "cpu": cpu}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=5.0, help="durée par mesure (s)")
+    parser.add_argument("--threshold", type=float, default=10.0, help="seuil d'agrégation (fires/s)")
+    args = parser.parse_args()
+
+    print(f"{'fires/s':>8} {'mode':<9} {'fires':>7} {'messages':>9} {'msg/s':>8} {'octets':>9} {'CPU':>8}")
+    for rate in (10, 100, 1000):
+        for mode in ("legacy", "adaptive"):
+            r = run(mode, rate, args.duration, args.threshold)
+            print(
+                f"{rate:>8} {mode:<9} {r['fired']:>7} {r['messages']:>9} "
+                f"{r['messages'] / args.duration:>8.1f} {r['bytes']:>9} {r['cpu'] * 1000:>6.0f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
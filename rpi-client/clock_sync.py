@@ -0,0 +1,117 @@
+"""Estimation du décalage d'horloge avec le backend (style NTP)."""
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+
+def parse_timestamp(value: Union[str, int, float]) -> float:
+    """Convertit un horodatage backend (ISO 8601 ou epoch en ms) en secondes epoch."""
+    if isinstance(value, (int, float)):
+        return value / 1000.0
+    # fromisoformat ne gère le suffixe "Z" qu'à partir de Python 3.11
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class ClockSync:
+    """Estime l'horloge du backend à partir des échanges ping/pong.
+
+    Chaque échange donne un échantillon : t0 (envoi du ping), t3 (réception du
+    pong) et ts (horodatage du pong côté backend). Comme en NTP, le décalage vaut
+    ts - (t0 + t3) / 2 et le délai aller-retour t3 - t0. Parmi les derniers
+    échantillons, celui de plus faible incertitude est retenu : délai / 2, plus
+    la dérive possible des horloges depuis la mesure (`max_drift` s/s), ce qui
+    fait préférer un échantillon récent à un échantillon ancien à peine meilleur.
+
+    Les mesures sont faites sur l'horloge monotone, ce qui rend l'estimation
+    insensible aux sauts de l'horloge système du Pi.
+    """
+
+    def __init__(self, window: int = 8, max_delay: float = 1.0, max_drift: float = 100e-6):
+        self.window = window
+        self.max_delay = max_delay
+        self.max_drift = max_drift
+        self._samples: deque[tuple[float, float, float]] = deque(maxlen=window)  # (offset, delay, t3)
+        self._pings_in_flight: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def mark_ping_sent(self):
+        """Note l'instant d'émission effective d'un ping."""
+        self._pings_in_flight.append(time.monotonic())
+
+    def reset_pending(self):
+        """Oublie les pings sans réponse (à appeler à chaque nouvelle connexion)."""
+        self._pings_in_flight.clear()
+
+    def on_pong(self, server_timestamp: Union[str, int, float], received_at: Optional[float] = None) -> bool:
+        """Ajoute un échantillon à partir d'un pong. Retourne False s'il est rejeté."""
+        t3 = received_at if received_at is not None else time.monotonic()
+        # Les pongs arrivent dans l'ordre des pings sur une même connexion
+        if not self._pings_in_flight:
+            return False
+        t0 = self._pings_in_flight.popleft()
+
+        try:
+            ts = parse_timestamp(server_timestamp)
+        except (TypeError, ValueError):
+            return False
+
+        delay = t3 - t0
+        if delay < 0 or delay > self.max_delay:
+            return False
+
+        with self._lock:
+            self._samples.append((ts - (t0 + t3) / 2, delay, t3))
+        return True
+
+    def _best(self) -> Optional[tuple[float, float]]:
+        """Retourne (décalage, incertitude) de l'échantillon le plus fiable à cet instant."""
+        now = time.monotonic()
+        with self._lock:
+            if not self._samples:
+                return None
+            return min(
+                ((offset, delay / 2 + self.max_drift * (now - t3)) for offset, delay, t3 in self._samples),
+                key=lambda s: s[1],
+            )
+
+    @property
+    def synced(self) -> bool:
+        return self._best() is not None
+
+    @property
+    def offset(self) -> Optional[float]:
+        """Décalage (s) : horloge backend - horloge monotone locale."""
+        best = self._best()
+        return best[0] if best else None
+
+    @property
+    def uncertainty(self) -> Optional[float]:
+        """Incertitude (s) de l'estimation retenue (délai / 2 + dérive depuis la mesure)."""
+        best = self._best()
+        return best[1] if best else None
+
+    def server_now(self) -> float:
+        """Heure courante du backend estimée (secondes epoch)."""
+        return self.to_server(time.monotonic())
+
+    def to_server(self, monotonic_time: float) -> float:
+        """Convertit un instant monotone local en heure backend (secondes epoch)."""
+        offset = self.offset
+        if offset is None:
+            return time.time() + (monotonic_time - time.monotonic())
+        return monotonic_time + offset
+
+    def to_monotonic(self, server_time: float) -> float:
+        """Convertit une heure backend (secondes epoch) en échéance monotone locale."""
+        offset = self.offset
+        if offset is None:
+            # Pas encore synchronisé : se rabattre sur l'horloge système
+            return time.monotonic() + (server_time - time.time())
+        return server_time - offset
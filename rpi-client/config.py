@@ -17,9 +17,37 @@ HEARTBEAT_INTERVAL = int(os.getenv("HEARTBEAT_INTERVAL", "30"))
 # Reconnect delay (seconds)
 RECONNECT_DELAY = int(os.getenv("RECONNECT_DELAY", "5"))
 
+# Outbound send queue: memory budget (bytes) and drain timeout on disconnect (seconds)
+SEND_QUEUE_MAX_BYTES = int(os.getenv("SEND_QUEUE_MAX_BYTES", str(256 * 1024)))
+SEND_QUEUE_DRAIN_TIMEOUT = float(os.getenv("SEND_QUEUE_DRAIN_TIMEOUT", "2"))
+
+# Clock synchronization: number of pings sent right after connecting, and their spacing (seconds)
+CLOCK_SYNC_BURST = int(os.getenv("CLOCK_SYNC_BURST", "8"))
+CLOCK_SYNC_BURST_INTERVAL = float(os.getenv("CLOCK_SYNC_BURST_INTERVAL", "0.25"))
+
+# Trigger telemetry: above this rate (fires/s) trigger_fired events are replaced by periodic summaries.
+# Defaults for triggers that don't set aggregateAbove / summaryInterval in their config; 0 disables
+TELEMETRY_AGGREGATE_ABOVE = float(os.getenv("TELEMETRY_AGGREGATE_ABOVE", "10"))
+TELEMETRY_SUMMARY_INTERVAL = int(os.getenv("TELEMETRY_SUMMARY_INTERVAL", "1000"))
+
 # GPIO mode (BCM or BOARD)
 GPIO_MODE = os.getenv("GPIO_MODE", "BCM")
 
+# Hardware PWM (sysfs, requires the pwm/pwm-2chan overlay); other pins use software PWM
+PWM_HARDWARE = os.getenv("PWM_HARDWARE", "true").lower() == "true"
+PWM_CHIP = os.getenv("PWM_CHIP", "/sys/class/pwm/pwmchip0")
+# Highest software PWM frequency (Hz); faster requests are capped, use a hardware PWM pin instead
+PWM_SOFTWARE_MAX_FREQUENCY = float(os.getenv("PWM_SOFTWARE_MAX_FREQUENCY", "200"))
+
+# GPIO output thread: optional CPU to pin it to, SCHED_FIFO priority (tried by default, falls back to
+# normal scheduling without root/CAP_SYS_NICE; 0 = don't try), command ring size
+OUTPUT_CPU = int(os.getenv("OUTPUT_CPU")) if os.getenv("OUTPUT_CPU") else None
+OUTPUT_RT_PRIORITY = int(os.getenv("OUTPUT_RT_PRIORITY", "10"))
+OUTPUT_RING_SIZE = int(os.getenv("OUTPUT_RING_SIZE", "1024"))
+# Optional interpreter GIL switch interval (seconds) applied while the output thread runs, e.g. 0.0005.
+# Process-wide; 0 keeps Python's default (0.005)
+OUTPUT_SWITCH_INTERVAL = float(os.getenv("OUTPUT_SWITCH_INTERVAL", "0"))
+
 # Simulation mode (for testing without actual GPIO hardware)
 SIMULATION_MODE = os.getenv("SIMULATION_MODE", "false").lower() == "true"
 
@@ -1,8 +1,15 @@
 """Gestion des GPIO du Raspberry Pi."""
 import time
-import threading
 from typing import Callable, Optional
-from config import SIMULATION_MODE, GPIO_MODE
+from config import (
+    SIMULATION_MODE, GPIO_MODE, PWM_HARDWARE, PWM_CHIP, PWM_SOFTWARE_MAX_FREQUENCY,
+    OUTPUT_CPU, OUTPUT_RT_PRIORITY, OUTPUT_RING_SIZE, OUTPUT_SWITCH_INTERVAL,
+)
+from output_dispatcher import OutputDispatcher
+from pwm import (
+    PWMEngine, HardwarePWM, HARDWARE_PWM_CHANNELS,
+    HARDWARE_DEFAULT_FREQUENCY, SOFTWARE_DEFAULT_FREQUENCY,
+)
 
 if not SIMULATION_MODE:
     try:
@@ -22,7 +29,21 @@ class GPIOHandler:
     def __init__(self):
         self.callbacks: dict[int, Callable] = {}
         self.output_states: dict[int, bool] = {}
-        self.pulse_timers: dict[int, threading.Timer] = {}
+        self.pending_pulses: dict[int, object] = {}
+        self.dispatcher = OutputDispatcher(
+            self._gpio_write,
+            capacity=OUTPUT_RING_SIZE,
+            cpu=OUTPUT_CPU,
+            rt_priority=OUTPUT_RT_PRIORITY,
+            switch_interval=OUTPUT_SWITCH_INTERVAL,
+        )
+        # Fronts PWM logiciels planifiés à l'avance sur le thread de sortie
+        self.pwm = PWMEngine(
+            self._pwm_write,
+            max_frequency=PWM_SOFTWARE_MAX_FREQUENCY,
+            schedule=self.dispatcher.call,
+        )
+        self.hardware_pwm: dict[int, HardwarePWM] = {}
         self._setup_done = False
 
     def setup(self):
@@ -35,6 +56,7 @@ class GPIOHandler:
             GPIO.setmode(mode)
             GPIO.setwarnings(False)
 
+        self.dispatcher.start()
         self._setup_done = True
         print(f"✅ GPIO initialisé (mode: {GPIO_MODE}, simulation: {not GPIO_AVAILABLE})")
 
@@ -87,43 +109,108 @@ class GPIOHandler:
         self.output_states[pin] = initial_state
         print(f"📍 GPIO {pin} configuré en sortie (état initial: {initial_state})")
 
-    def set_output(self, pin: int, state: bool):
-        """Définit l'état d'une sortie GPIO."""
+    def set_output(self, pin: int, state: bool, due: float = 0.0):
+        """Définit l'état d'une sortie GPIO, immédiatement ou à l'échéance `due` (time.monotonic)."""
+        if self.pwm.is_active(pin):
+            self.stop_pwm(pin)
+        # Repasser en GPIO classique fait perdre au pin sa fonction PWM matérielle
+        self.hardware_pwm.pop(pin, None)
         if pin not in self.output_states:
             self.setup_output(pin)
 
-        if GPIO_AVAILABLE:
-            GPIO.output(pin, GPIO.HIGH if state else GPIO.LOW)
+        self._write_pin(pin, state, due)
+        print(f"⚡ GPIO {pin} -> {'HIGH' if state else 'LOW'}")
 
+    def _write_pin(self, pin: int, state: bool, due: float = 0.0):
+        """Demande l'écriture d'une sortie au thread de sortie, sans journalisation."""
         self.output_states[pin] = state
-        print(f"⚡ GPIO {pin} -> {'HIGH' if state else 'LOW'}")
+        self.dispatcher.submit(pin, state, due)
+
+    def _pwm_write(self, pin: int, state: bool):
+        """Front de PWM logicielle, exécuté sur le thread de sortie à son échéance."""
+        self.output_states[pin] = state
+        self._gpio_write(pin, state)
 
-    def toggle_output(self, pin: int):
+    def _gpio_write(self, pin: int, state: bool):
+        """Écriture physique, exécutée uniquement sur le thread de sortie."""
+        if GPIO_AVAILABLE:
+            GPIO.output(pin, GPIO.HIGH if state else GPIO.LOW)
+
+    def toggle_output(self, pin: int, due: float = 0.0):
         """Inverse l'état d'une sortie GPIO."""
         current_state = self.output_states.get(pin, False)
-        self.set_output(pin, not current_state)
+        self.set_output(pin, not current_state, due)
 
-    def pulse_output(self, pin: int, state: bool, duration_ms: int):
+    def pulse_output(self, pin: int, state: bool, duration_ms: int, due: float = 0.0):
         """Génère une impulsion sur une sortie GPIO."""
-        # Annuler un timer précédent s'il existe
-        if pin in self.pulse_timers:
-            self.pulse_timers[pin].cancel()
+        # Une nouvelle impulsion remplace la précédente : seule la dernière se termine
+        token = object()
+        self.pending_pulses[pin] = token
 
         # Activer la sortie
-        self.set_output(pin, state)
+        self.set_output(pin, state, due)
 
-        # Programmer la désactivation
+        # Programmer la désactivation sur le thread de sortie, à l'échéance exacte
         def reset():
-            self.set_output(pin, not state)
-            if pin in self.pulse_timers:
-                del self.pulse_timers[pin]
+            if self.pending_pulses.get(pin) is token:
+                del self.pending_pulses[pin]
+                self.output_states[pin] = not state
+                self._gpio_write(pin, not state)
 
-        timer = threading.Timer(duration_ms / 1000.0, reset)
-        self.pulse_timers[pin] = timer
-        timer.start()
+        start = max(due, time.monotonic())
+        self.dispatcher.call(reset, due=start + duration_ms / 1000.0)
 
         print(f"⏱️  GPIO {pin} pulse {'HIGH' if state else 'LOW'} pendant {duration_ms}ms")
 
+    def set_pwm(self, pin: int, frequency: Optional[float], duty_cycle: float, fade_ms: int = 0):
+        """Génère un signal PWM (duty_cycle en %), avec rampe optionnelle depuis l'état actuel.
+
+        Sans fréquence, 1000Hz sur un canal matériel et 50Hz en PWM logicielle.
+        """
+        self.pending_pulses.pop(pin, None)
+        duty = duty_cycle / 100.0
+
+        hardware = self._open_hardware_pwm(pin)
+        if hardware is not None:
+            try:
+                applied = self.pwm.start(pin, frequency or HARDWARE_DEFAULT_FREQUENCY, duty, fade_ms, hardware=hardware)
+            except OSError as e:
+                # Droits sysfs, période refusée... : abandonner le canal et repasser en logiciel
+                print(f"⚠️  PWM matériel GPIO {pin} en échec ({e}) - repli sur la PWM logicielle")
+                self.hardware_pwm.pop(pin, None)
+                hardware = None
+
+        if hardware is None:
+            if pin not in self.output_states:
+                self.setup_output(pin)
+            applied = self.pwm.start(pin, frequency or SOFTWARE_DEFAULT_FREQUENCY, duty, fade_ms)
+
+        mode = "matériel" if hardware else "logiciel"
+        fade = f", rampe {fade_ms}ms" if fade_ms else ""
+        print(f"〰️  GPIO {pin} PWM {mode} {applied:g}Hz {duty_cycle}%{fade}")
+
+    def _open_hardware_pwm(self, pin: int) -> Optional[HardwarePWM]:
+        """Retourne le canal PWM matériel du pin s'il est utilisable."""
+        if pin in self.hardware_pwm:
+            return self.hardware_pwm[pin]
+        if not (GPIO_AVAILABLE and PWM_HARDWARE and GPIO_MODE == "BCM"):
+            return None
+        # Un pin déjà configuré en sortie GPIO a perdu sa fonction PWM ;
+        # deux pins d'un même canal ne peuvent pas être pilotés indépendamment
+        channel = HARDWARE_PWM_CHANNELS.get(pin)
+        if pin in self.output_states or any(HARDWARE_PWM_CHANNELS[p] == channel for p in self.hardware_pwm):
+            return None
+
+        hardware = HardwarePWM.open(pin, PWM_CHIP)
+        if hardware:
+            self.hardware_pwm[pin] = hardware
+        return hardware
+
+    def stop_pwm(self, pin: int):
+        """Arrête le signal PWM d'un pin (sortie au niveau bas)."""
+        self.pwm.stop(pin)
+        print(f"〰️  GPIO {pin} PWM arrêté")
+
     def read_input(self, pin: int) -> bool:
         """Lit l'état d'une entrée GPIO."""
         if GPIO_AVAILABLE:
@@ -132,10 +219,12 @@ class GPIOHandler:
 
     def cleanup(self):
         """Nettoie les ressources GPIO."""
-        # Annuler tous les timers
-        for timer in self.pulse_timers.values():
-            timer.cancel()
-        self.pulse_timers.clear()
+        # Annuler les fins d'impulsion et la PWM, puis laisser le thread de sortie
+        # exécuter les écritures en attente avant de libérer les pins
+        self.pending_pulses.clear()
+        self.pwm.stop_all()
+        self.hardware_pwm.clear()
+        self.dispatcher.stop()
 
         if GPIO_AVAILABLE:
             GPIO.cleanup()
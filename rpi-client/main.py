@@ -4,11 +4,19 @@ import asyncio
 import argparse
 import signal
 import sys
+import threading
+import time
 from config import DEVICE_ID, SIMULATION_MODE
 from gpio_handler import GPIOHandler
 from action_executor import ActionExecutor
 from trigger_manager import TriggerManager
 from ws_client import WSClient
+from clock_sync import parse_timestamp
+from precise_timer import PreciseTimer
+
+# Avance (s) avec laquelle une exécution planifiée est lancée : les sorties GPIO
+# attendent ensuite l'échéance sur le thread de sortie
+SCHEDULED_LEAD = 0.005
 
 
 class RPIClient:
@@ -17,11 +25,14 @@ class RPIClient:
     def __init__(self, device_id: str):
         self.device_id = device_id
         self.gpio = GPIOHandler()
+        # L'instant exact des sorties est tenu par le thread de sortie : pas d'attente active ici
+        self.timer = PreciseTimer(spin=0.0)
         self.action_executor = ActionExecutor(self.gpio)
         self.trigger_manager = TriggerManager(
             gpio=self.gpio,
             action_executor=self.action_executor,
-            on_trigger_fired=self._on_trigger_fired
+            on_trigger_fired=self._on_trigger_fired,
+            on_trigger_summary=self._on_trigger_summary,
         )
         self.ws_client = WSClient(
             on_config=self._on_config_received,
@@ -39,10 +50,50 @@ class RPIClient:
         """Callback quand un trigger est déclenché localement."""
         self.ws_client.send_trigger_fired(trigger_id, trigger_name)
 
-    def _on_execute_trigger(self, trigger_id: str, trigger_name: str, actions: list):
+    def _on_trigger_summary(self, summary: dict):
+        """Callback quand un résumé de trigger agrégé est prêt."""
+        self.ws_client.send_trigger_summary(summary)
+
+    def _on_execute_trigger(self, trigger_id: str, trigger_name: str, actions: list, execute_at=None):
         """Callback quand le backend demande d'exécuter un trigger."""
-        print(f"⚡ Exécution du trigger '{trigger_name}' avec {len(actions)} action(s)")
-        self.action_executor.execute_actions(trigger_id, trigger_name, actions)
+        if execute_at is None:
+            print(f"⚡ Exécution du trigger '{trigger_name}' avec {len(actions)} action(s)")
+            self.action_executor.execute_actions(trigger_id, trigger_name, actions)
+            return
+
+        try:
+            target = parse_timestamp(execute_at)
+        except (TypeError, ValueError):
+            print(f"⚠️  executeAt invalide: {execute_at} - exécution immédiate")
+            self.action_executor.execute_actions(trigger_id, trigger_name, actions)
+            return
+
+        clock = self.ws_client.clock
+        if not clock.synced:
+            print("⚠️  Horloge non synchronisée - utilisation de l'horloge système")
+
+        deadline = clock.to_monotonic(target)
+
+        def fire(_started_at: float):
+            # Un rechargement de config a pu arrêter le thread de sortie depuis la planification
+            self.gpio.setup()
+
+            # Relevé sur le thread de sortie à l'échéance, juste avant la première écriture
+            output_at = []
+            marked = threading.Event()
+
+            def mark():
+                output_at.append(time.monotonic())
+                marked.set()
+
+            queued = self.gpio.dispatcher.call(mark, due=deadline)
+            self.action_executor.execute_actions(trigger_id, trigger_name, actions, due=deadline)
+            # Le rapport part après les sorties pour ne pas retarder le chemin critique
+            fired_at = output_at[0] if queued and marked.wait(1.0) else time.monotonic()
+            self.ws_client.send_trigger_timing(trigger_id, trigger_name, target, clock.to_server(fired_at))
+
+        print(f"⏱️  Trigger '{trigger_name}' planifié dans {(deadline - time.monotonic()) * 1000:.1f}ms")
+        self.timer.schedule(deadline - SCHEDULED_LEAD, fire)
 
     async def run(self):
         """Démarre le client."""
@@ -66,6 +117,7 @@ class RPIClient:
     async def shutdown(self):
         """Arrête proprement le client."""
         print("\n🛑 Arrêt en cours...")
+        self.timer.cancel_all()
         self.trigger_manager.clear_all()
         await self.ws_client.disconnect()
         print("👋 Au revoir!")
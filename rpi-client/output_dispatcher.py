@@ -0,0 +1,243 @@
+"""Thread dédié aux écritures GPIO, alimenté par un anneau de commandes préalloué."""
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+OP_WRITE = 0  # écrire `value` sur `pin`
+OP_CALL = 1   # appeler `value()` (configuration, fin d'impulsion...)
+
+# Attente active pour des commandes datées rapprochées : fraction de l'écart avec
+# la précédente, sans descendre sous la latence de réveil typique d'un thread
+SPIN_GAP_FRACTION = 0.1
+SPIN_MIN = 0.0002
+
+
+class CommandRing:
+    """Anneau de commandes multi-producteurs / un consommateur, sans verrou.
+
+    Les emplacements sont préalloués ; chacun porte un numéro de séquence qui
+    indique s'il est libre pour un producteur ou publié pour le consommateur
+    (schéma de D. Vyukov). Les producteurs réservent un ticket avec
+    `itertools.count`, dont l'incrément est atomique sous le GIL.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        if capacity & (capacity - 1):
+            raise ValueError("la capacité doit être une puissance de 2")
+        self.capacity = capacity
+        self._mask = capacity - 1
+        # [séquence, op, pin, valeur, échéance]
+        self._slots = [[i, 0, 0, None, 0.0] for i in range(capacity)]
+        self._tickets = itertools.count()
+        self._read = 0
+
+    def push(self, op: int, pin: int, value, due: float = 0.0, give_up: Optional[Callable[[], bool]] = None) -> bool:
+        """Publie une commande. Attend (sans verrou) si l'anneau est plein.
+
+        Si `give_up()` devient vrai pendant l'attente (consommateur arrêté),
+        retourne False ; le ticket réservé n'est jamais publié et l'anneau doit
+        être remplacé avant de redémarrer un consommateur.
+        """
+        ticket = next(self._tickets)
+        slot = self._slots[ticket & self._mask]
+        while slot[0] != ticket:
+            # Anneau plein : le consommateur n'a pas encore libéré cet emplacement
+            if give_up is not None and give_up():
+                return False
+            time.sleep(0)
+        slot[1] = op
+        slot[2] = pin
+        slot[3] = value
+        slot[4] = due
+        slot[0] = ticket + 1
+        return True
+
+    def ready(self) -> bool:
+        """Indique si une commande publiée attend le consommateur."""
+        return self._slots[self._read & self._mask][0] == self._read + 1
+
+    def pop(self) -> Optional[tuple]:
+        """Retire la prochaine commande publiée, ou None (consommateur unique)."""
+        slot = self._slots[self._read & self._mask]
+        if slot[0] != self._read + 1:
+            return None
+        command = (slot[1], slot[2], slot[3], slot[4])
+        slot[3] = None
+        slot[0] = self._read + self.capacity
+        self._read += 1
+        return command
+
+
+class OutputDispatcher:
+    """Exécute toutes les écritures GPIO sur un seul thread.
+
+    Le thread peut être épinglé sur un CPU (`sched_setaffinity`) et passer en
+    ordonnancement temps réel SCHED_FIFO si les droits le permettent. Les
+    commandes datées (`due`, horloge monotone) sont gardées dans un tas local
+    et exécutées à l'échéance, en attente active sur les dernières `spin`
+    secondes ; pour des commandes rapprochées (fronts PWM), l'attente active
+    est réduite en proportion de l'écart avec la précédente.
+
+    `switch_interval` (optionnel) réduit l'intervalle de bascule du GIL tant que
+    le thread tourne : sans cela, un thread Python occupé peut retarder le thread
+    de sortie de plusieurs millisecondes. Le réglage est global au process ; la
+    valeur précédente est rétablie par `stop`.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[int, bool], None],
+        capacity: int = 1024,
+        cpu: Optional[int] = None,
+        rt_priority: int = 0,
+        switch_interval: Optional[float] = None,
+        spin: float = 0.001,
+    ):
+        self.write = write
+        self.cpu = cpu
+        self.rt_priority = rt_priority
+        self.switch_interval = switch_interval
+        self.spin = spin
+        self._ring = CommandRing(capacity)
+        self._wake = threading.Event()
+        self._sleeping = False
+        self._timed: list[tuple[float, int, int, int, object]] = []
+        self._order = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._previous_switch_interval: Optional[float] = None
+
+    def start(self):
+        """Démarre le thread de sortie."""
+        if self._running:
+            return
+        self._running = True
+        # Un producteur a pu abandonner un ticket lors de l'arrêt précédent
+        self._ring = CommandRing(self._ring.capacity)
+        if self.switch_interval:
+            self._previous_switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(self.switch_interval)
+        self._thread = threading.Thread(target=self._run, name="gpio-output", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le thread après avoir exécuté les commandes immédiates en attente."""
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        self._thread.join()
+        if self._previous_switch_interval is not None:
+            sys.setswitchinterval(self._previous_switch_interval)
+            self._previous_switch_interval = None
+
+    def submit(self, pin: int, state: bool, due: float = 0.0) -> bool:
+        """Demande l'écriture d'une sortie, immédiate ou à l'échéance `due`.
+
+        Retourne False si le thread de sortie est arrêté (commande abandonnée).
+        """
+        return self._push(OP_WRITE, pin, state, due)
+
+    def call(self, fn: Callable[[], None], due: float = 0.0) -> bool:
+        """Exécute `fn` sur le thread de sortie, dans l'ordre des écritures.
+
+        Retourne False si le thread de sortie est arrêté (`fn` ne sera pas appelée).
+        """
+        return self._push(OP_CALL, 0, fn, due)
+
+    def _push(self, op: int, pin: int, value, due: float) -> bool:
+        if not self._running or not self._ring.push(op, pin, value, due, give_up=self._stopped):
+            print(f"⚠️  Thread de sortie arrêté - commande GPIO {pin} abandonnée")
+            return False
+        if not self._running:
+            # stop() a pu vider l'anneau avant la publication : la commande est considérée perdue
+            print(f"⚠️  Thread de sortie arrêté pendant l'envoi - commande GPIO {pin} abandonnée")
+            return False
+        # Le consommateur actif relit l'anneau de lui-même : ne signaler que s'il dort
+        if self._sleeping:
+            self._wake.set()
+        return True
+
+    def _stopped(self) -> bool:
+        return not self._running
+
+    def _sleep(self, timeout: Optional[float] = None):
+        """Attend une nouvelle commande, au plus `timeout` secondes."""
+        self._wake.clear()
+        self._sleeping = True
+        # Une commande publiée avant que `_sleeping` soit visible n'a pas été signalée,
+        # et un stop() antérieur au clear() non plus
+        if self._running and not self._ring.ready():
+            self._wake.wait(timeout)
+        self._sleeping = False
+
+    def _setup_thread(self):
+        """Applique l'affinité CPU et la priorité temps réel au thread courant."""
+        if self.cpu is not None:
+            try:
+                os.sched_setaffinity(0, {self.cpu})
+                print(f"📌 Thread de sortie GPIO épinglé sur le CPU {self.cpu}")
+            except (AttributeError, OSError) as e:
+                print(f"⚠️  Affinité CPU impossible: {e}")
+
+        if self.rt_priority > 0:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.rt_priority))
+                print(f"⏫ Thread de sortie GPIO en SCHED_FIFO (priorité {self.rt_priority})")
+            except (AttributeError, OSError) as e:
+                print(f"⚠️  Priorité temps réel refusée ({e}) - ordonnancement normal")
+
+    def _execute(self, op: int, pin: int, value):
+        try:
+            if op == OP_WRITE:
+                self.write(pin, value)
+            else:
+                value()
+        except Exception as e:
+            print(f"❌ Erreur sortie GPIO {pin}: {e}")
+
+    def _run(self):
+        self._setup_thread()
+        ring = self._ring
+        timed = self._timed
+        last_due = 0.0
+
+        while self._running:
+            # Commandes immédiates ; les commandes datées vont dans le tas
+            command = ring.pop()
+            while command is not None:
+                op, pin, value, due = command
+                if due:
+                    heapq.heappush(timed, (due, next(self._order), op, pin, value))
+                else:
+                    self._execute(op, pin, value)
+                command = ring.pop()
+
+            if timed:
+                due = timed[0][0]
+                spin = min(self.spin, max((due - last_due) * SPIN_GAP_FRACTION, SPIN_MIN))
+                remaining = due - time.monotonic()
+                if remaining > spin:
+                    self._sleep(remaining - spin)
+                    continue
+                due, _, op, pin, value = heapq.heappop(timed)
+                while time.monotonic() < due:
+                    pass
+                self._execute(op, pin, value)
+                last_due = due
+                continue
+
+            self._sleep()
+
+        # Vider les commandes immédiates restantes avant de s'arrêter
+        command = ring.pop()
+        while command is not None:
+            op, pin, value, due = command
+            if not due:
+                self._execute(op, pin, value)
+            command = ring.pop()
+        timed.clear()
@@ -0,0 +1,58 @@
+"""Timer haute précision pour les exécutions planifiées à l'instant près."""
+import threading
+import time
+from typing import Callable
+
+
+class PreciseTimer:
+    """Exécute des callbacks à une échéance monotone.
+
+    Chaque échéance a son propre thread : il dort jusqu'à `spin` secondes avant
+    l'échéance puis termine en attente active, ce qui évite la gigue de réveil
+    de l'ordonnanceur (`threading.Timer` a une précision de l'ordre de la
+    milliseconde). Un callback long (séquence d'actions avec délais) ne retarde
+    donc pas les autres échéances.
+    """
+
+    def __init__(self, spin: float = 0.002):
+        self.spin = spin
+        self._cancelled = threading.Event()
+        self._threads: set[threading.Thread] = set()
+        self._lock = threading.Lock()
+
+    def schedule(self, deadline: float, callback: Callable[[float], None]):
+        """Planifie `callback(fired_at)` à l'échéance `deadline` (time.monotonic)."""
+        with self._lock:
+            cancelled = self._cancelled
+            thread = threading.Thread(
+                target=self._wait_and_fire, args=(deadline, callback, cancelled), daemon=True
+            )
+            self._threads.add(thread)
+        thread.start()
+
+    def _wait_and_fire(self, deadline: float, callback: Callable[[float], None], cancelled: threading.Event):
+        try:
+            remaining = deadline - time.monotonic() - self.spin
+            if remaining > 0 and cancelled.wait(remaining):
+                return
+            while time.monotonic() < deadline:
+                pass
+            if cancelled.is_set():
+                return
+            callback(time.monotonic())
+        except Exception as e:
+            print(f"❌ Erreur timer: {e}")
+        finally:
+            with self._lock:
+                self._threads.discard(threading.current_thread())
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._threads)
+
+    def cancel_all(self):
+        """Abandonne toutes les échéances en attente."""
+        with self._lock:
+            self._cancelled.set()
+            self._cancelled = threading.Event()
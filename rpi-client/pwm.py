@@ -0,0 +1,317 @@
+"""Sorties PWM : canaux matériels (sysfs) et moteur PWM logiciel partagé."""
+import math
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+# Canaux PWM matériels par pin BCM (Raspberry Pi 1 à 4, overlay pwm / pwm-2chan)
+HARDWARE_PWM_CHANNELS = {12: 0, 18: 0, 13: 1, 19: 1}
+
+# Fréquences par défaut (Hz) quand l'action n'en précise pas
+HARDWARE_DEFAULT_FREQUENCY = 1000
+SOFTWARE_DEFAULT_FREQUENCY = 50
+
+# Pas de mise à jour du rapport cyclique pendant une rampe (secondes)
+FADE_STEP = 0.01
+
+# Fraction de la période au-delà de laquelle l'attente active n'est pas prolongée
+SPIN_PERIOD_FRACTION = 0.1
+
+
+class HardwarePWM:
+    """Canal PWM matériel piloté via /sys/class/pwm."""
+
+    def __init__(self, chip_path: str, channel: int):
+        self.path = os.path.join(chip_path, f"pwm{channel}")
+        self.period_ns = 0
+        if not os.path.isdir(self.path):
+            self._write(os.path.join(chip_path, "export"), channel)
+        # Le kernel crée le répertoire du canal de façon asynchrone après l'export
+        for _ in range(50):
+            if os.path.isdir(self.path):
+                break
+            time.sleep(0.01)
+        else:
+            raise OSError(f"canal PWM {channel} indisponible dans {chip_path}")
+
+    @classmethod
+    def open(cls, pin: int, chip_path: str) -> Optional["HardwarePWM"]:
+        """Ouvre le canal matériel d'un pin BCM, ou None s'il n'en a pas."""
+        channel = HARDWARE_PWM_CHANNELS.get(pin)
+        if channel is None or not os.path.isdir(chip_path):
+            return None
+        try:
+            return cls(chip_path, channel)
+        except OSError as e:
+            print(f"⚠️  PWM matériel indisponible sur GPIO {pin}: {e}")
+            return None
+
+    @staticmethod
+    def _write(path: str, value):
+        with open(path, "w") as f:
+            f.write(str(value))
+
+    def configure(self, frequency: float, duty: float):
+        """Applique fréquence (Hz) et rapport cyclique (0..1)."""
+        period_ns = int(1e9 / frequency)
+        duty_ns = int(period_ns * duty)
+        if period_ns != self.period_ns:
+            # duty_cycle doit rester <= period : réduire le duty avant de changer la période
+            self._write(os.path.join(self.path, "duty_cycle"), 0)
+            self._write(os.path.join(self.path, "period"), period_ns)
+            self.period_ns = period_ns
+        self._write(os.path.join(self.path, "duty_cycle"), duty_ns)
+        self._write(os.path.join(self.path, "enable"), 1)
+
+    def set_duty(self, duty: float):
+        self._write(os.path.join(self.path, "duty_cycle"), int(self.period_ns * duty))
+
+    def disable(self):
+        self._write(os.path.join(self.path, "enable"), 0)
+
+
+class _Channel:
+    """État commun d'une sortie PWM : fréquence et rampe du rapport cyclique."""
+
+    def __init__(self, pin: int, frequency: float, duty: float, fade_from: float, fade_s: float, now: float):
+        self.pin = pin
+        self.period = 1.0 / frequency
+        self.duty_from = fade_from
+        self.duty_to = duty
+        self.fade_start = now
+        self.fade_end = now + fade_s
+
+    def duty_at(self, t: float) -> float:
+        if t >= self.fade_end:
+            return self.duty_to
+        progress = (t - self.fade_start) / (self.fade_end - self.fade_start)
+        return self.duty_from + (self.duty_to - self.duty_from) * progress
+
+    @property
+    def duty(self) -> float:
+        return self.duty_at(time.monotonic())
+
+
+class _SoftwareChannel(_Channel):
+    """Sortie PWM générée par basculement du pin aux instants calculés."""
+
+    def __init__(self, *args, emit: Callable[["_SoftwareChannel", bool, float], None]):
+        super().__init__(*args)
+        self.emit = emit
+        self.period_start = self.fade_start
+        self.next_event = self.fade_start
+        # État inconnu au départ : le premier front est toujours écrit
+        self.high: Optional[bool] = None
+        self.in_high_phase = False
+
+    def on_event(self, now: float):
+        # Décroché de plus d'une période (GIL, charge) : repartir de maintenant
+        if self.next_event < now - self.period:
+            self.next_event = now
+            self.in_high_phase = False
+
+        at = self.next_event
+        if self.in_high_phase:
+            self._set(False, at)
+            self.in_high_phase = False
+            self.next_event = self.period_start + self.period
+            return
+
+        # Début de période : les instants sont calculés, pas mesurés, pour éviter la dérive
+        self.period_start = at
+        high_time = self.duty_at(self.period_start) * self.period
+        if high_time <= 0:
+            self._set(False, at)
+            self.next_event = self.period_start + self.period
+        elif high_time >= self.period:
+            self._set(True, at)
+            self.next_event = self.period_start + self.period
+        else:
+            self._set(True, at)
+            self.in_high_phase = True
+            self.next_event = self.period_start + high_time
+
+    def _set(self, state: bool, at: float):
+        if state != self.high:
+            self.emit(self, state, at)
+            self.high = state
+
+    def close(self):
+        # Toujours écrire : des fronts planifiés mais abandonnés ont pu laisser le pin haut
+        self.emit(self, False, 0.0)
+        self.high = False
+
+
+class _HardwareChannel(_Channel):
+    """Sortie PWM matérielle ; le moteur n'intervient que pour faire avancer les rampes."""
+
+    def __init__(self, *args, hardware: HardwarePWM):
+        super().__init__(*args)
+        self.hardware = hardware
+        self.hardware.configure(1.0 / self.period, self.duty_at(self.fade_start))
+        self.next_event = self.fade_start + FADE_STEP if self.fade_end > self.fade_start else math.inf
+
+    def on_event(self, now: float):
+        try:
+            self.hardware.set_duty(self.duty_at(now))
+        except OSError as e:
+            print(f"❌ Erreur PWM matériel GPIO {self.pin}: {e}")
+        self.next_event = now + FADE_STEP if now < self.fade_end else math.inf
+
+    def close(self):
+        try:
+            self.hardware.disable()
+        except OSError as e:
+            print(f"❌ Erreur PWM matériel GPIO {self.pin}: {e}")
+
+
+class PWMEngine:
+    """Moteur PWM unique : un seul thread sert toutes les sorties PWM.
+
+    Les sorties logicielles sont basculées aux instants calculés ; le thread dort
+    jusqu'à `spin` secondes avant chaque front puis termine en attente active.
+    L'attente active est ramenée à une fraction de la plus courte période et la
+    fréquence logicielle est plafonnée à `max_frequency` : au-delà, le thread ne
+    dormirait plus et occuperait un cœur. Les sorties matérielles ne sollicitent
+    le thread que pendant une rampe.
+
+    Avec `schedule` (`OutputDispatcher.call`), les fronts sont confiés `lead`
+    secondes à l'avance au thread de sortie comme commandes datées : c'est lui
+    qui tient l'instant exact, et le moteur n'attend plus activement. Un front
+    planifié est abandonné si la sortie est modifiée ou arrêtée entre-temps.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[int, bool], None],
+        spin: float = 0.001,
+        max_frequency: float = 200.0,
+        schedule: Optional[Callable[[Callable[[], None], float], None]] = None,
+        lead: float = 0.01,
+    ):
+        self.write = write
+        self.spin = spin
+        self.max_frequency = max_frequency
+        self.schedule = schedule
+        self.lead = lead if schedule else 0.0
+        self._spin = spin
+        self._channels: dict[int, _Channel] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(
+        self,
+        pin: int,
+        frequency: float,
+        duty: float,
+        fade_ms: int = 0,
+        hardware: Optional[HardwarePWM] = None,
+    ) -> float:
+        """Démarre ou modifie la PWM d'un pin. `duty` est entre 0 et 1.
+
+        Avec `fade_ms`, le rapport cyclique passe progressivement de sa valeur
+        actuelle à `duty`. Retourne la fréquence appliquée. Si le canal matériel
+        refuse la configuration, l'OSError est propagée et la sortie actuelle du
+        pin reste en place.
+        """
+        if frequency <= 0:
+            raise ValueError(f"fréquence invalide: {frequency}")
+        if hardware is None and frequency > self.max_frequency:
+            print(
+                f"⚠️  GPIO {pin}: PWM logicielle limitée à {self.max_frequency:g}Hz ({frequency:g}Hz demandés) "
+                f"- utiliser un pin PWM matériel (BCM {', '.join(map(str, sorted(HARDWARE_PWM_CHANNELS)))})"
+            )
+            frequency = self.max_frequency
+        duty = min(max(duty, 0.0), 1.0)
+        now = time.monotonic()
+
+        with self._cond:
+            previous = self._channels.get(pin)
+            fade_from = previous.duty if previous else 0.0
+            args = (pin, frequency, duty, fade_from, fade_ms / 1000.0, now)
+            if hardware is not None:
+                channel = _HardwareChannel(*args, hardware=hardware)
+            else:
+                channel = _SoftwareChannel(*args, emit=self._emit)
+            if previous is not None and type(previous) is not type(channel):
+                previous.close()
+            self._channels[pin] = channel
+            self._update_spin()
+            self._cond.notify()
+
+        self._ensure_thread()
+        return frequency
+
+    def stop(self, pin: int):
+        """Arrête la PWM d'un pin (sortie au niveau bas)."""
+        with self._cond:
+            channel = self._channels.pop(pin, None)
+            if channel:
+                channel.close()
+                self._update_spin()
+                self._cond.notify()
+
+    def stop_all(self):
+        """Arrête toutes les sorties PWM."""
+        with self._cond:
+            for channel in self._channels.values():
+                channel.close()
+            self._channels.clear()
+            self._update_spin()
+            self._cond.notify()
+
+    def is_active(self, pin: int) -> bool:
+        with self._cond:
+            return pin in self._channels
+
+    def _update_spin(self):
+        """Adapte l'attente active à la plus courte période logicielle (lock tenu)."""
+        periods = [c.period for c in self._channels.values() if isinstance(c, _SoftwareChannel)]
+        self._spin = min([self.spin] + [p * SPIN_PERIOD_FRACTION for p in periods])
+
+    def _emit(self, channel: _SoftwareChannel, state: bool, at: float):
+        """Écrit un front, ou le confie au thread de sortie pour l'instant `at` (0 = immédiat)."""
+        pin = channel.pin
+        if self.schedule is None:
+            self.write(pin, state)
+            return
+
+        def edge():
+            # Sortie modifiée ou arrêtée depuis la planification : front abandonné
+            if not at or self._channels.get(pin) is channel:
+                self.write(pin, state)
+
+        self.schedule(edge, at)
+
+    def _wake_at(self, channel: _Channel) -> float:
+        """Instant où le moteur doit traiter le prochain événement d'une sortie."""
+        if isinstance(channel, _SoftwareChannel):
+            return channel.next_event - self.lead
+        return channel.next_event
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="pwm-engine", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                # Fronts planifiés à l'avance : pas d'attente active ici
+                spin = 0.0 if self.schedule else self._spin
+                wake = min((self._wake_at(c) for c in self._channels.values()), default=math.inf)
+                remaining = wake - time.monotonic()
+                if remaining > spin:
+                    # Réveillé plus tôt si une sortie est ajoutée ou modifiée
+                    self._cond.wait(None if wake == math.inf else remaining - spin)
+                    continue
+
+            while time.monotonic() < wake:
+                pass
+
+            with self._cond:
+                now = time.monotonic()
+                for channel in self._channels.values():
+                    while self._wake_at(channel) <= now:
+                        channel.on_event(now)
@@ -14,6 +14,12 @@ python_files = [
     'action_executor.py',
     'trigger_manager.py',
     'ws_client.py',
+    'send_queue.py',
+    'clock_sync.py',
+    'precise_timer.py',
+    'pwm.py',
+    'output_dispatcher.py',
+    'telemetry.py',
 ]
 
 a = Analysis(
@@ -0,0 +1,170 @@
+"""File d'envoi prioritaire et bornée pour les messages sortants."""
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+# Classes de priorité (plus petit = plus prioritaire)
+PRIORITY_CONTROL = 0    # register, ping, rapports de synchronisation
+PRIORITY_ERROR = 1      # erreurs du device
+PRIORITY_TELEMETRY = 2  # trigger_fired, action_executed
+
+# Politiques de débordement, appliquées à la classe du message une fois les
+# classes moins prioritaires vidées
+POLICY_DROP_OLDEST = "drop_oldest"  # supprime les plus anciens messages de la même classe
+POLICY_DROP_NEWEST = "drop_newest"  # refuse le nouveau message
+
+DEFAULT_POLICIES = {
+    PRIORITY_CONTROL: POLICY_DROP_OLDEST,
+    PRIORITY_ERROR: POLICY_DROP_OLDEST,
+    PRIORITY_TELEMETRY: POLICY_DROP_OLDEST,
+}
+
+
+class SendQueue:
+    """File de messages sortants avec priorités, budget mémoire et politique de débordement.
+
+    Les messages sont sérialisés à l'insertion ; le budget porte sur la taille
+    cumulée des chaînes JSON en attente. `put` est utilisable depuis n'importe
+    quel thread (callbacks RPi.GPIO, scheduler), `get` et `close` depuis la
+    boucle asyncio à laquelle la file est attachée.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024, policies: Optional[dict[int, str]] = None):
+        self.max_bytes = max_bytes
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self._queues: dict[int, deque[tuple[str, Optional[Callable]]]] = {p: deque() for p in sorted(self.policies)}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._not_empty: Optional[asyncio.Event] = None
+        self._closed = False
+        self.dropped: dict[int, int] = {p: 0 for p in self._queues}
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """Attache la file à la boucle asyncio qui consommera les messages."""
+        self._loop = loop
+        self._not_empty = asyncio.Event()
+        self._closed = False
+        self._set_state()
+
+    def put(self, message: dict, priority: int = PRIORITY_TELEMETRY, on_sent: Optional[Callable] = None) -> bool:
+        """Ajoute un message. Retourne False s'il a été rejeté faute de place.
+
+        `on_sent` est rendu avec le message par `get` ; le consommateur l'appelle
+        juste avant l'émission (instant de départ pour la synchronisation d'horloge).
+        """
+        data = json.dumps(message)
+        size = len(data)
+
+        with self._lock:
+            if size > self.max_bytes or not self._make_room(priority, size):
+                self.dropped[priority] += 1
+                return False
+            self._queues[priority].append((data, on_sent))
+            self._bytes += size
+
+        self._wake()
+        return True
+
+    def _make_room(self, priority: int, size: int) -> bool:
+        """Libère de la place pour un message de la classe `priority` (lock tenu).
+
+        Les classes moins prioritaires sont toujours évincées en premier, des plus
+        basses aux plus hautes ; la politique de la classe ne décide que du sort
+        de ses propres messages.
+        """
+        if self._bytes + size <= self.max_bytes:
+            return True
+
+        for p in sorted(self._queues, reverse=True):
+            if p <= priority:
+                break
+            if self._evict(p, size):
+                return True
+
+        if self.policies[priority] == POLICY_DROP_NEWEST:
+            return False
+        return self._evict(priority, size)
+
+    def _evict(self, priority: int, size: int) -> bool:
+        """Supprime les plus anciens messages d'une classe jusqu'à avoir `size` octets libres."""
+        queue = self._queues[priority]
+        while queue and self._bytes + size > self.max_bytes:
+            self._bytes -= len(queue.popleft()[0])
+            self.dropped[priority] += 1
+        return self._bytes + size <= self.max_bytes
+
+    def _wake(self):
+        """Réveille le consommateur, y compris depuis un autre thread."""
+        if self._not_empty is None or self._loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._set_state()
+        else:
+            self._loop.call_soon_threadsafe(self._set_state)
+
+    def _set_state(self):
+        """Met à jour les événements de la boucle selon le contenu de la file."""
+        with self._lock:
+            pending = self._bytes > 0
+        if pending or self._closed:
+            self._not_empty.set()
+        else:
+            self._not_empty.clear()
+
+    def _pop(self) -> Optional[tuple[str, Optional[Callable]]]:
+        """Retire le message le plus prioritaire (lock tenu)."""
+        for queue in self._queues.values():
+            if queue:
+                item = queue.popleft()
+                self._bytes -= len(item[0])
+                return item
+        return None
+
+    def get_nowait(self) -> Optional[tuple[str, Optional[Callable]]]:
+        """Retire le prochain message sans attendre, ou None si la file est vide."""
+        with self._lock:
+            item = self._pop()
+        if self._not_empty is not None:
+            self._set_state()
+        return item
+
+    async def get(self) -> Optional[tuple[str, Optional[Callable]]]:
+        """Attend et retire le prochain message : (chaîne JSON, on_sent).
+
+        Retourne None une fois la file fermée et vidée.
+        """
+        while True:
+            item = self.get_nowait()
+            if item is not None or self._closed:
+                return item
+            await self._not_empty.wait()
+
+    def close(self):
+        """Ferme la file : `get` rendra les messages restants puis None."""
+        self._closed = True
+        if self._not_empty is not None:
+            self._not_empty.set()
+
+    def clear(self, priority: Optional[int] = None):
+        """Vide la file (ou une seule classe)."""
+        with self._lock:
+            for p, queue in self._queues.items():
+                if priority is None or p == priority:
+                    self._bytes -= sum(len(d) for d, _ in queue)
+                    queue.clear()
+        self._wake()
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(q) for q in self._queues.values())
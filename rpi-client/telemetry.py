@@ -0,0 +1,203 @@
+"""Agrégation adaptative des notifications de triggers à haute fréquence."""
+import math
+import threading
+import time
+from typing import Callable, Optional
+
+# Période minimale des résumés (s) : en dessous, le thread de résumé tournerait à vide
+MIN_SUMMARY_INTERVAL = 0.1
+
+
+def _number(value, default: float) -> float:
+    """Retourne `value` si c'est un nombre fini, sinon `default` (config saisie côté backend)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return value
+    return default
+
+
+class _TriggerStats:
+    """État d'agrégation d'un trigger."""
+
+    def __init__(self, name: str, rate: float, interval: float):
+        self.name = name
+        self.rate = rate          # fires/s au-delà desquels on agrège (0 = jamais)
+        self.interval = interval  # période des résumés (s)
+        self.tokens = self.capacity
+        self.refilled_at = time.monotonic()
+        self.aggregating = False
+        self.window_start = 0.0
+        self.window_count = 0
+        self._reset_summary()
+
+    def _reset_summary(self):
+        self.count = 0
+        self.failures = 0
+        self.first_at = 0.0
+        self.last_at = 0.0
+        self.last_mono = 0.0
+        self.min_interval = math.inf
+        self.max_interval = 0.0
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, self.rate * self.interval)
+
+    def take_token(self, now: float) -> bool:
+        """Seau à jetons : `rate` envois individuels par seconde, rafale d'un intervalle."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def add(self, now: float):
+        wall = time.time()
+        if self.count:
+            gap = now - self.last_mono
+            self.min_interval = min(self.min_interval, gap)
+            self.max_interval = max(self.max_interval, gap)
+        else:
+            self.first_at = wall
+        self.count += 1
+        self.last_at = wall
+        self.last_mono = now
+
+    def summary(self, trigger_id: str) -> dict:
+        summary = {
+            "triggerId": trigger_id,
+            "triggerName": self.name,
+            "count": self.count,
+            "failures": self.failures,
+            "firstAt": round(self.first_at * 1000),
+            "lastAt": round(self.last_at * 1000),
+            "minIntervalMs": round(self.min_interval * 1000, 3) if self.count > 1 else None,
+            "maxIntervalMs": round(self.max_interval * 1000, 3) if self.count > 1 else None,
+        }
+        self._reset_summary()
+        return summary
+
+
+class TelemetryAggregator:
+    """Choisit, à chaque déclenchement, entre notification individuelle et résumé.
+
+    Sous le seuil (`aggregateAbove` fires/s), chaque déclenchement est notifié.
+    Au-delà, les déclenchements sont comptés et un résumé (nombre, premier/dernier
+    horodatage, intervalles min/max) est émis toutes les `summaryInterval` ms.
+    Le retour aux notifications individuelles se fait après un intervalle
+    complet sous le seuil.
+    """
+
+    def __init__(
+        self,
+        on_summary: Callable[[dict], None],
+        default_rate: float = 10.0,
+        default_interval_ms: int = 1000,
+    ):
+        self.on_summary = on_summary
+        self.default_rate = default_rate
+        self.default_interval_ms = default_interval_ms
+        self._stats: dict[str, _TriggerStats] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def configure(self, trigger_id: str, name: str, config: dict):
+        """Enregistre les seuils d'un trigger (`aggregateAbove`, `summaryInterval`).
+
+        Les valeurs non numériques sont ignorées et la période est ramenée à
+        au moins `MIN_SUMMARY_INTERVAL`.
+        """
+        rate = _number(config.get("aggregateAbove"), self.default_rate)
+        interval_ms = _number(config.get("summaryInterval"), self.default_interval_ms)
+        interval = max(interval_ms / 1000.0, MIN_SUMMARY_INTERVAL)
+        with self._cond:
+            self._stats[trigger_id] = _TriggerStats(name, rate, interval)
+
+    def record(self, trigger_id: str) -> bool:
+        """Comptabilise un déclenchement. Retourne True s'il doit être notifié individuellement."""
+        now = time.monotonic()
+        with self._cond:
+            stats = self._stats.get(trigger_id)
+            if stats is None or stats.rate <= 0:
+                return True
+
+            if not stats.aggregating:
+                if stats.take_token(now):
+                    return True
+                # Seuil dépassé : passer en mode résumé
+                stats.aggregating = True
+                stats.window_start = now
+                stats.window_count = 0
+                self._cond.notify()
+
+            stats.window_count += 1
+            stats.add(now)
+
+        self._ensure_thread()
+        return False
+
+    def record_failure(self, trigger_id: str):
+        """Compte un échec d'actions pour un déclenchement agrégé."""
+        with self._cond:
+            stats = self._stats.get(trigger_id)
+            if stats is not None:
+                stats.failures += 1
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            summaries = []
+            with self._cond:
+                now = time.monotonic()
+                next_flush = math.inf
+                for trigger_id, stats in self._stats.items():
+                    if not stats.aggregating:
+                        continue
+                    end = stats.window_start + stats.interval
+                    if end > now:
+                        next_flush = min(next_flush, end)
+                        continue
+
+                    if stats.count:
+                        summaries.append(stats.summary(trigger_id))
+                    # Hystérésis : repasser en individuel après un intervalle sous le seuil
+                    if stats.window_count < stats.rate * stats.interval:
+                        stats.aggregating = False
+                        stats.tokens = stats.capacity
+                        stats.refilled_at = now
+                    else:
+                        stats.window_start = end if now - end < stats.interval else now
+                        stats.window_count = 0
+                        next_flush = min(next_flush, stats.window_start + stats.interval)
+
+                if not summaries:
+                    self._cond.wait(None if next_flush == math.inf else next_flush - now)
+                    continue
+
+            for summary in summaries:
+                try:
+                    self.on_summary(summary)
+                except Exception as e:
+                    print(f"❌ Erreur envoi résumé: {e}")
+
+    def flush(self):
+        """Émet immédiatement les résumés en cours (rechargement de config, arrêt)."""
+        with self._cond:
+            summaries = [
+                stats.summary(trigger_id)
+                for trigger_id, stats in self._stats.items()
+                if stats.aggregating and stats.count
+            ]
+        for summary in summaries:
+            self.on_summary(summary)
+
+    def clear(self):
+        """Oublie tous les triggers après avoir émis les résumés en cours."""
+        self.flush()
+        with self._cond:
+            self._stats.clear()
+            self._cond.notify()
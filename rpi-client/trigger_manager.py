@@ -5,15 +5,29 @@ import time
 from typing import Callable, Optional
 from gpio_handler import GPIOHandler
 from action_executor import ActionExecutor
+from config import TELEMETRY_AGGREGATE_ABOVE, TELEMETRY_SUMMARY_INTERVAL
+from telemetry import TelemetryAggregator
 
 
 class TriggerManager:
     """Gère les triggers configurés pour le device."""
 
-    def __init__(self, gpio: GPIOHandler, action_executor: ActionExecutor, on_trigger_fired: Optional[Callable] = None):
+    def __init__(
+        self,
+        gpio: GPIOHandler,
+        action_executor: ActionExecutor,
+        on_trigger_fired: Optional[Callable] = None,
+        on_trigger_summary: Optional[Callable] = None,
+    ):
         self.gpio = gpio
         self.action_executor = action_executor
         self.on_trigger_fired = on_trigger_fired
+        self.on_trigger_summary = on_trigger_summary
+        self.telemetry = TelemetryAggregator(
+            on_summary=self._on_summary,
+            default_rate=TELEMETRY_AGGREGATE_ABOVE,
+            default_interval_ms=TELEMETRY_SUMMARY_INTERVAL,
+        )
         self.triggers: dict[str, dict] = {}
         self._scheduler_thread: Optional[threading.Thread] = None
         self._scheduler_running = False
@@ -44,6 +58,7 @@ class TriggerManager:
         actions = trigger["actions"]
 
         self.triggers[trigger_id] = trigger
+        self.telemetry.configure(trigger_id, trigger_name, config)
         print(f"🔧 Trigger: {trigger_name} ({trigger_type})")
 
         if trigger_type == "gpio_input":
@@ -97,10 +112,19 @@ class TriggerManager:
 
     def _fire_trigger(self, trigger_id: str, name: str, actions: list):
         """Déclenche l'exécution des actions d'un trigger."""
-        if self.on_trigger_fired:
+        # Au-delà du seuil de fréquence, le déclenchement est compté dans un résumé
+        individual = self.telemetry.record(trigger_id)
+        if individual and self.on_trigger_fired:
             self.on_trigger_fired(trigger_id, name)
 
-        self.action_executor.execute_actions(trigger_id, name, actions)
+        success = self.action_executor.execute_actions(trigger_id, name, actions, report=individual)
+        if not individual and not success:
+            self.telemetry.record_failure(trigger_id)
+
+    def _on_summary(self, summary: dict):
+        """Transmet le résumé d'un trigger agrégé."""
+        if self.on_trigger_summary:
+            self.on_trigger_summary(summary)
 
     def _start_scheduler(self):
         """Démarre le thread du scheduler."""
@@ -127,6 +151,7 @@ class TriggerManager:
         """Nettoie tous les triggers."""
         self._stop_scheduler()
         self.gpio.cleanup()
+        self.telemetry.clear()
         self.triggers.clear()
         print("🧹 Triggers nettoyés")
 
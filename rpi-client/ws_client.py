@@ -3,8 +3,15 @@ import json
 import asyncio
 import websockets
 import socket
+import time
 from typing import Callable, Optional
-from config import BACKEND_WS_URL, DEVICE_ID, HEARTBEAT_INTERVAL, RECONNECT_DELAY
+from config import (
+    BACKEND_WS_URL, DEVICE_ID, HEARTBEAT_INTERVAL, RECONNECT_DELAY,
+    SEND_QUEUE_MAX_BYTES, SEND_QUEUE_DRAIN_TIMEOUT,
+    CLOCK_SYNC_BURST, CLOCK_SYNC_BURST_INTERVAL,
+)
+from clock_sync import ClockSync
+from send_queue import SendQueue, PRIORITY_CONTROL, PRIORITY_ERROR, PRIORITY_TELEMETRY
 
 
 class WSClient:
@@ -14,19 +21,24 @@ class WSClient:
         self,
         on_config: Optional[Callable[[dict], None]] = None,
         on_config_update: Optional[Callable[[dict], None]] = None,
-        on_execute_trigger: Optional[Callable[[str, str, list], None]] = None,
+        on_execute_trigger: Optional[Callable[[str, str, list, Optional[str]], None]] = None,
     ):
         self.on_config = on_config
         self.on_config_update = on_config_update
-        self.on_execute_trigger = on_execute_trigger  # (trigger_id, trigger_name, actions)
+        self.on_execute_trigger = on_execute_trigger  # (trigger_id, trigger_name, actions, execute_at)
+        self.clock = ClockSync()
         self.ws: Optional[websockets.WebSocketClientProtocol] = None
         self._running = False
         self._device_id = DEVICE_ID
+        self._queue = SendQueue(max_bytes=SEND_QUEUE_MAX_BYTES)
+        self._writer_task: Optional[asyncio.Task] = None
+        self._received_at = 0.0
 
     async def connect(self):
         """Se connecte au backend WebSocket."""
         self._running = True
-        
+        self._queue.attach(asyncio.get_running_loop())
+
         while self._running:
             try:
                 print(f"🔌 Connexion à {BACKEND_WS_URL}...")
@@ -37,13 +49,19 @@ class WSClient:
                     # S'enregistrer auprès du backend
                     await self._register()
                     
-                    # Démarrer le heartbeat
+                    # Démarrer l'envoi des messages en file et le heartbeat
+                    self.clock.reset_pending()
+                    self._writer_task = asyncio.create_task(self._writer_loop(ws))
                     heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+                    sync_task = asyncio.create_task(self._sync_burst())
                     
                     try:
                         await self._receive_loop()
                     finally:
                         heartbeat_task.cancel()
+                        sync_task.cancel()
+                        self._writer_task.cancel()
+                        self._writer_task = None
                         
             except websockets.ConnectionClosed:
                 print("🔌 Connexion perdue")
@@ -69,18 +87,50 @@ class WSClient:
             "ipAddress": ip_address,
         })
 
+    def _send_ping(self):
+        """Met un ping en file ; son instant d'émission sert à la synchronisation d'horloge."""
+        self._enqueue({
+            "type": "ping",
+            "deviceId": self._device_id,
+        }, PRIORITY_CONTROL, on_sent=self.clock.mark_ping_sent)
+
     async def _heartbeat_loop(self):
         """Envoie des pings réguliers au backend."""
         while True:
             await asyncio.sleep(HEARTBEAT_INTERVAL)
-            await self._send({
-                "type": "ping",
-                "deviceId": self._device_id,
-            })
+            self._send_ping()
+
+    async def _sync_burst(self):
+        """Envoie une rafale de pings après connexion pour synchroniser l'horloge rapidement."""
+        for _ in range(CLOCK_SYNC_BURST):
+            self._send_ping()
+            await asyncio.sleep(CLOCK_SYNC_BURST_INTERVAL)
+
+        if self.clock.synced:
+            print(f"🕐 Horloge synchronisée (incertitude ±{self.clock.uncertainty * 1000:.1f}ms)")
+
+    async def _writer_loop(self, ws):
+        """Envoie les messages de la file, par ordre de priorité."""
+        try:
+            while True:
+                item = await self._queue.get()
+                if item is None:
+                    return
+                data, on_sent = item
+                if on_sent:
+                    on_sent()
+                await ws.send(data)
+        except websockets.ConnectionClosed:
+            return
+        except Exception as e:
+            # Sans writer, plus de heartbeat : fermer pour que connect() se reconnecte
+            print(f"❌ Erreur d'envoi: {e} - fermeture de la connexion")
+            await ws.close()
 
     async def _receive_loop(self):
         """Boucle de réception des messages."""
         async for message in self.ws:
+            self._received_at = time.monotonic()
             try:
                 data = json.loads(message)
                 await self._handle_message(data)
@@ -105,12 +155,14 @@ class WSClient:
             trigger_id = message.get("triggerId")
             trigger_name = message.get("triggerName")
             actions = message.get("actions", [])
+            execute_at = message.get("executeAt")
             print(f"\n🎯 Commande reçue: exécuter trigger '{trigger_name}'")
             if self.on_execute_trigger:
-                self.on_execute_trigger(trigger_id, trigger_name, actions)
+                self.on_execute_trigger(trigger_id, trigger_name, actions, execute_at)
         
         elif msg_type == "pong":
-            pass  # Heartbeat acknowledgment
+            # Acquittement du heartbeat, utilisé pour la synchronisation d'horloge
+            self.clock.on_pong(message.get("timestamp"), self._received_at)
         
         elif msg_type == "error":
             print(f"❌ Erreur du backend: {message.get('message')}")
@@ -119,42 +171,78 @@ class WSClient:
             print(f"📨 Message: {msg_type}")
 
     async def _send(self, message: dict):
-        """Envoie un message au backend."""
+        """Envoie un message au backend immédiatement, sans passer par la file."""
         if self.ws:
             await self.ws.send(json.dumps(message))
 
+    def _enqueue(self, message: dict, priority: int, on_sent: Optional[Callable] = None):
+        """Place un message dans la file d'envoi (utilisable depuis n'importe quel thread)."""
+        if not self._queue.put(message, priority, on_sent):
+            print(f"⚠️  File d'envoi pleine: message '{message.get('type')}' abandonné")
+
     def send_trigger_fired(self, trigger_id: str, trigger_name: str):
         """Envoie une notification de trigger déclenché."""
-        asyncio.create_task(self._send({
+        self._enqueue({
             "type": "trigger_fired",
             "deviceId": self._device_id,
             "triggerId": trigger_id,
             "triggerName": trigger_name,
-        }))
+        }, PRIORITY_TELEMETRY)
+
+    def send_trigger_summary(self, summary: dict):
+        """Envoie le résumé des déclenchements d'un trigger à haute fréquence."""
+        self._enqueue({
+            "type": "trigger_summary",
+            "deviceId": self._device_id,
+            **summary,
+        }, PRIORITY_TELEMETRY)
 
     def send_action_executed(self, trigger_id: str, action_id: str, action_name: str, success: bool):
         """Envoie une notification d'action exécutée."""
-        asyncio.create_task(self._send({
+        self._enqueue({
             "type": "action_executed",
             "deviceId": self._device_id,
             "triggerId": trigger_id,
             "actionId": action_id,
             "actionName": action_name,
             "success": success,
-        }))
+        }, PRIORITY_TELEMETRY)
+
+    def send_trigger_timing(self, trigger_id: str, trigger_name: str, execute_at: float, fired_at: float):
+        """Envoie la précision obtenue pour une exécution planifiée (horloge backend, secondes epoch)."""
+        uncertainty = self.clock.uncertainty
+        self._enqueue({
+            "type": "trigger_timing",
+            "deviceId": self._device_id,
+            "triggerId": trigger_id,
+            "triggerName": trigger_name,
+            "executeAt": round(execute_at * 1000, 3),
+            "firedAt": round(fired_at * 1000, 3),
+            "skewMs": round((fired_at - execute_at) * 1000, 3),
+            "clockSynced": self.clock.synced,
+            "clockUncertaintyMs": round(uncertainty * 1000, 3) if uncertainty is not None else None,
+        }, PRIORITY_CONTROL)
 
     def send_error(self, error: str, context: dict = None):
         """Envoie une notification d'erreur."""
-        asyncio.create_task(self._send({
+        self._enqueue({
             "type": "error",
             "deviceId": self._device_id,
             "error": error,
             "context": context or {},
-        }))
+        }, PRIORITY_ERROR)
 
     async def disconnect(self):
-        """Ferme la connexion."""
+        """Ferme la connexion après avoir vidé la file d'envoi."""
         self._running = False
+        self._queue.close()
+        if self._writer_task:
+            try:
+                await asyncio.wait_for(self._writer_task, SEND_QUEUE_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                print(f"⚠️  {len(self._queue)} message(s) non envoyé(s) à la fermeture")
+            except (asyncio.CancelledError, websockets.ConnectionClosed):
+                pass
         if self.ws:
             await self.ws.close()
 